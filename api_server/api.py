@@ -9,7 +9,9 @@ from pydantic.networks import HttpUrl
 
 from .models_api import APIUserVote, APIRatingSummary, APICredibilityScore, VoteVal
 from .models_sql import CredibilityScore, RatingSummary, Vote, User
+from .site_cache import get_cached_summary, get_cached_score
 from .sql import cast_vote, AutoSession
+from .vote_filter import might_have_vote
 
 main_router: Final[APIRouter] = APIRouter()
 
@@ -20,6 +22,8 @@ async def get_credibility_rating(site: HttpUrl, session: AutoSession) -> Credibi
     if (domain_name := site.host) is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid domain in URL')
 
+    if (cached := get_cached_score(domain_name)) is not None:
+        return cached
     return await session.get(CredibilityScore, domain_name) or CredibilityScore(site_domain=domain_name)
 
 
@@ -29,6 +33,8 @@ async def get_community_rating(site: HttpUrl, session: AutoSession) -> RatingSum
     if (domain_name := site.host) is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid domain in URL')
 
+    if (cached := get_cached_summary(domain_name)) is not None:
+        return cached
     return await session.get(RatingSummary, domain_name) or RatingSummary(site_domain=domain_name)
 
 
@@ -59,6 +65,9 @@ async def remove_user_vote(site: HttpUrl, request: Request, response: Response,
     """Removes a personal vote on a given domain."""
     if (client := request.client) is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Unauthorized')
+    if site.host is not None and not might_have_vote(client.host, site.host):
+        response.status_code = status.HTTP_204_NO_CONTENT
+        return  # definitely no vote to remove; skip the database entirely
     if await session.get(User, client.host) is None:
         response.status_code = status.HTTP_204_NO_CONTENT
         return  # if user doesn't exist, then definitely no vote to remove
@@ -88,6 +97,8 @@ async def get_user_vote_for(site: HttpUrl, request: Request, session: AutoSessio
     if (domain_name := site.host) is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid domain in URL')
 
+    if not might_have_vote(client.host, domain_name):
+        return 0
     if (vote_obj := await session.get(Vote, (client.host, domain_name))) is None:
         return 0
     return vote_obj.value
@@ -1,3 +1,4 @@
+import time
 from contextlib import asynccontextmanager
 from typing import Final
 
@@ -7,8 +8,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from .api import main_router
 from .api_testing import testing_router
 from .models_sql import init_datamodels
-from .params import DB_URI, DB_ARGS
-from .sql import db_construct_models, db_connect
+from .params import LOGGER, DB_URI, DB_ARGS, VOTE_FILTER_ENABLED, PRELOAD_TOP_SITES
+from .sql import db_construct_models, db_connect, db_load_vote_filter, db_preload_top_sites
 
 
 # noinspection PyUnusedLocal
@@ -17,7 +18,25 @@ async def lifespan_manager(app: FastAPI):
     # on startup
     init_datamodels()
     engine = db_connect(DB_URI, DB_ARGS)
-    await db_construct_models(engine)
+
+    start = time.perf_counter()
+    created = await db_construct_models(engine)
+    LOGGER.info('Schema %s in %.3fs', 'constructed' if created else 'up to date; skipped construction',
+                time.perf_counter() - start)
+
+    if VOTE_FILTER_ENABLED:
+        start = time.perf_counter()
+        vote_filter = await db_load_vote_filter(engine)
+        LOGGER.info('Vote filter loaded in %.3fs: %d entries, %d bytes, %d hashes, '
+                    'designed for %.4g false-positive rate at %d entries (currently %.4g)',
+                    time.perf_counter() - start, vote_filter.count, vote_filter.memory_bytes,
+                    vote_filter.num_hashes, vote_filter.target_fp_rate, vote_filter.capacity,
+                    vote_filter.estimated_fp_rate)
+
+    if PRELOAD_TOP_SITES > 0:
+        start = time.perf_counter()
+        num_sites = await db_preload_top_sites(engine, PRELOAD_TOP_SITES)
+        LOGGER.info('Preloaded %d most-voted sites in %.3fs', num_sites, time.perf_counter() - start)
     yield
     # on shutdown
     pass
@@ -2,7 +2,7 @@
 ORM datamodels.
 """
 
-__all__ = ['User', 'Site', 'Vote', 'RatingSummary', 'CredibilityScore', 'init_datamodels']
+__all__ = ['User', 'Site', 'Vote', 'RatingSummary', 'CredibilityScore', 'SchemaVersion', 'init_datamodels']
 
 from datetime import datetime
 from typing import Optional
@@ -45,6 +45,11 @@ class CredibilityScore(SQLModel, APICredibilityScore, table=True):
     site: Site = Relationship(back_populates='credibility_score', sa_relationship_kwargs={'lazy': 'selectin'})
 
 
+class SchemaVersion(SQLModel, table=True):
+    # single row holding the fingerprint of the schema that was last constructed
+    version: str = Field(primary_key=True, max_length=64)
+
+
 def init_datamodels():
     # nothing actually needs to be done here
     # we're just making sure that this module gets imported
@@ -2,11 +2,16 @@
 Runtime and configuration parameters for the API server.
 """
 
-__all__ = ['DB_URI', 'DB_ARGS', 'DEMO_MODE']
+__all__ = ['LOGGER', 'DB_URI', 'DB_ARGS', 'DEMO_MODE', 'VOTE_FILTER_ENABLED', 'VOTE_FILTER_FP_RATE',
+           'VOTE_FILTER_MIN_CAPACITY', 'VOTE_FILTER_REPORT_INTERVAL', 'PRELOAD_TOP_SITES', 'PRELOAD_TTL']
 
+import logging
 from os import getenv
 from typing import Final
 
+# uvicorn only configures its own loggers; this one is printed at INFO and above
+LOGGER: Final[logging.Logger] = logging.getLogger('uvicorn.error')
+
 USERNAME = getenv('USERNAME')
 PASSWORD = getenv('PASSWORD')
 SERVER = getenv('SERVER')
@@ -17,3 +22,19 @@ DB_ARGS: Final[dict[str, str]] = {}
 
 # enable demo mode to populate sites with random votes and credibility scores upon first vote cast
 DEMO_MODE: Final[bool] = False
+
+# in-memory filter used to skip database lookups for users who have not voted on a site.
+# OFF by default: it only sees votes cast through its own process, so only enable it for
+# single-process deployments (e.g. ``run.py``; no multiple workers, no overlapping processes during restarts)
+VOTE_FILTER_ENABLED: Final[bool] = False
+# target false-positive rate of the vote filter at its sized capacity
+VOTE_FILTER_FP_RATE: Final[float] = 0.01
+# filter is sized for max(2 * existing votes, this) entries
+VOTE_FILTER_MIN_CAPACITY: Final[int] = 100_000
+# log the vote filter's fill and estimated false-positive rate every this many insertions
+VOTE_FILTER_REPORT_INTERVAL: Final[int] = 1_000
+
+# number of most-voted sites whose ratings and scores are preloaded into memory on startup (0 to disable)
+PRELOAD_TOP_SITES: Final[int] = 100
+# seconds after startup for which preloaded entries are served; bounds staleness from other processes' writes
+PRELOAD_TTL: Final[float] = 30.0
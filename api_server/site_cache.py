@@ -0,0 +1,72 @@
+"""
+Short-lived warm cache of rating summaries and credibility scores for popular sites.
+
+Populated once on startup with the most-voted sites so that their first
+requests after a restart do not hit the database.
+Entries expire ``PRELOAD_TTL`` seconds after loading and are never reloaded,
+which bounds how stale they can get with writes from other processes.
+Writes made through this process refresh an entry's value but not its expiry.
+"""
+
+__all__ = ['site_cache_init', 'get_cached_summary', 'get_cached_score', 'update_cached_summary',
+           'update_cached_score']
+
+from time import monotonic
+from typing import Iterable, TypeVar
+
+from .models_sql import RatingSummary, CredibilityScore
+from .params import PRELOAD_TTL
+
+_T = TypeVar('_T', RatingSummary, CredibilityScore)
+
+# domain -> (expiry time, detached copy)
+_SUMMARIES: dict[str, tuple[float, RatingSummary]] = {}
+_SCORES: dict[str, tuple[float, CredibilityScore]] = {}
+
+
+def _detached(obj: _T) -> _T:
+    # copy of column values only; not bound to any session
+    return type(obj).model_validate(obj.model_dump())
+
+
+def _get(cache: dict[str, tuple[float, _T]], domain: str) -> _T | None:
+    if (entry := cache.get(domain)) is None:
+        return None
+    expiry, obj = entry
+    if monotonic() >= expiry:
+        del cache[domain]
+        return None
+    return obj
+
+
+def _update(cache: dict[str, tuple[float, _T]], obj: _T) -> None:
+    if (entry := cache.get(obj.site_domain)) is not None:
+        cache[obj.site_domain] = (entry[0], _detached(obj))
+
+
+def site_cache_init(summaries: Iterable[RatingSummary], scores: Iterable[CredibilityScore]) -> int:
+    """(Re)populates the cache. Returns the number of cached sites."""
+    expiry = monotonic() + PRELOAD_TTL
+    _SUMMARIES.clear()
+    _SCORES.clear()
+    for summary in summaries:
+        _SUMMARIES[summary.site_domain] = (expiry, _detached(summary))
+    for score in scores:
+        _SCORES[score.site_domain] = (expiry, _detached(score))
+    return len(_SUMMARIES)
+
+
+def get_cached_summary(domain: str) -> RatingSummary | None:
+    return _get(_SUMMARIES, domain)
+
+
+def get_cached_score(domain: str) -> CredibilityScore | None:
+    return _get(_SCORES, domain)
+
+
+def update_cached_summary(summary: RatingSummary) -> None:
+    _update(_SUMMARIES, summary)
+
+
+def update_cached_score(score: CredibilityScore) -> None:
+    _update(_SCORES, score)
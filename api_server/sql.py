@@ -6,21 +6,27 @@ especially as they manage relational and cumulative state.
 """
 
 __all__ = ['ENGINE', 'get_session', 'AutoSession', 'db_connect', 'db_construct_models', 'get_or_create_user',
-           'get_or_create_site', 'cast_vote']
+           'get_or_create_site', 'cast_vote', 'db_load_vote_filter', 'db_preload_top_sites']
 
 import asyncio
 import random
+from hashlib import sha256
 from typing import Annotated, TypeAlias, AsyncGenerator
 
 from fastapi import Depends
 from pydantic import ValidationError
 from pydantic.v1 import NonNegativeFloat
+from sqlalchemy import inspect, delete, insert, Connection, Dialect
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateTable, CreateIndex
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
-from sqlmodel import SQLModel, select
+from sqlmodel import SQLModel, select, col
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .models_sql import User, Vote, RatingSummary, Site, CredibilityScore
-from .params import DEMO_MODE
+from .models_sql import User, Vote, RatingSummary, Site, CredibilityScore, SchemaVersion
+from .params import DEMO_MODE, VOTE_FILTER_FP_RATE, VOTE_FILTER_MIN_CAPACITY
+from .site_cache import site_cache_init, update_cached_summary, update_cached_score
+from .vote_filter import VoteFilter, vote_filter_init, might_have_vote, record_vote
 
 # global singleton database engine
 ENGINE: AsyncEngine | None = None
@@ -46,10 +52,76 @@ def db_connect(uri: str, args: dict, **kwargs) -> AsyncEngine:
     return ENGINE
 
 
-async def db_construct_models(engine: AsyncEngine):
+def _schema_fingerprint(dialect: Dialect) -> str:
+    """Hash of the DDL (tables, constraints and indexes) that ``create_all`` would emit for the dialect."""
+    parts = []
+    for table in SQLModel.metadata.sorted_tables:
+        parts.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda i: i.name or ''):
+            parts.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return sha256('\n'.join(parts).encode()).hexdigest()
+
+
+def _stored_schema_version(conn: Connection) -> str | None:
+    if not inspect(conn).has_table(SchemaVersion.__tablename__):
+        return None
+    return conn.execute(select(SchemaVersion.version)).scalar_one_or_none()
+
+
+def _write_schema_version(conn: Connection, version: str) -> None:
+    # insert-if-absent, so a worker that finds the row already written by another is a no-op
+    conn.execute(delete(SchemaVersion).where(col(SchemaVersion.version) != version))
+    if conn.execute(select(SchemaVersion.version)).first() is None:
+        conn.execute(insert(SchemaVersion).values(version=version))
+
+
+async def db_construct_models(engine: AsyncEngine, retries: int = 3) -> bool:
+    """Creates missing tables, unless the stored schema version matches the current models.
+    Returns whether construction ran.
+
+    Several workers starting at once may race here (DDL is not transactional on MySQL);
+    the loser of such a race backs off and re-checks the stored version.
+    """
+    version = _schema_fingerprint(engine.dialect)
+    for attempt in range(retries):
+        try:
+            return await _construct_models_once(engine, version)
+        except (IntegrityError, OperationalError, ProgrammingError):
+            await asyncio.sleep(random.uniform(0.1, 0.5) * (attempt + 1))
+    return await _construct_models_once(engine, version)
+
+
+async def _construct_models_once(engine: AsyncEngine, version: str) -> bool:
     # zero idea why we gotta do it like this; incomplete async interface in SQLModel
     async with engine.begin() as conn:
+        if await conn.run_sync(_stored_schema_version) == version:
+            return False
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_write_schema_version, version)
+    return True
+
+
+async def db_load_vote_filter(engine: AsyncEngine) -> VoteFilter:
+    """Builds the in-memory vote filter from all existing votes."""
+    async with AsyncSession(engine) as session:
+        keys = list(await session.exec(select(Vote.user_ip, Vote.site_domain)))
+    capacity = max(2 * len(keys), VOTE_FILTER_MIN_CAPACITY)
+    return vote_filter_init(capacity, VOTE_FILTER_FP_RATE, keys)
+
+
+async def db_preload_top_sites(engine: AsyncEngine, limit: int) -> int:
+    """Loads the rating summaries and credibility scores of the ``limit`` most-voted sites into memory.
+    Returns the number of sites loaded.
+    """
+    async with AsyncSession(engine) as session:
+        statement = (select(RatingSummary)
+                     .order_by((col(RatingSummary.up_votes) + col(RatingSummary.down_votes)).desc())
+                     .limit(limit))
+        summaries = list(await session.exec(statement))
+        domains = [summary.site_domain for summary in summaries]
+        scores = list(await session.exec(select(CredibilityScore)
+                                         .where(col(CredibilityScore.site_domain).in_(domains))))
+    return site_cache_init(summaries, scores)
 
 
 async def get_or_create_user(session: AsyncSession, user_ip: str) -> User:
@@ -108,6 +180,7 @@ async def create_credibility_score(session: AsyncSession, domain: str, score: No
     session.add(score_obj)
     await session.commit()
     await session.refresh(score_obj)
+    update_cached_score(score_obj)
     return score_obj
 
 
@@ -118,7 +191,7 @@ async def cast_vote(session: AsyncSession, user_ip: str, domain: str, vote: int)
     """
     if vote not in (-1, 0, 1):
         raise ValidationError(f'Invalid vote value: {vote}')
-    if vote == 0 and await session.get(Vote, (user_ip, domain)) is None:
+    if vote == 0 and (not might_have_vote(user_ip, domain) or await session.get(Vote, (user_ip, domain)) is None):
         return False
     user = await get_or_create_user(session, user_ip)
     site = (await get_or_create_site(session, domain))[0]
@@ -137,6 +210,7 @@ async def cast_vote(session: AsyncSession, user_ip: str, domain: str, vote: int)
             return False  # No change
         old_vote = 0
         vote_obj = Vote(site_domain=site.domain, user_ip=user.ip, value=vote)
+        record_vote(user.ip, site.domain)
     await _update_vote_count(session, domain, vote, old_vote)
     if vote_obj:
         session.add(vote_obj)
@@ -169,3 +243,4 @@ async def _update_vote_count(session: AsyncSession, domain: str, new_vote: int,
             rating_summary.down_votes += 1
     session.add(rating_summary)
     await session.commit()
+    update_cached_summary(rating_summary)
@@ -0,0 +1,116 @@
+"""
+In-memory approximate membership filter over cast votes.
+
+Most visitors never vote, so "does this user have a vote for this site?"
+is almost always answered with "no". A Bloom filter keyed by
+``(user_ip, site_domain)`` answers that without touching the database:
+a negative answer is definitive, a positive answer may be a false positive
+and must still be confirmed against the database.
+
+The filter lives in process memory and only learns of votes cast through
+this process, so it is only sound when this process is the sole writer.
+It is therefore disabled by default (see ``VOTE_FILTER_ENABLED``).
+"""
+
+__all__ = ['VOTE_FILTER', 'VoteFilter', 'vote_filter_init', 'might_have_vote', 'record_vote']
+
+import math
+from hashlib import blake2b
+from typing import Iterable
+
+from .params import LOGGER, VOTE_FILTER_ENABLED, VOTE_FILTER_REPORT_INTERVAL
+
+
+class VoteFilter:
+    """Bloom filter over ``(user_ip, site_domain)`` pairs.
+
+    Bloom filters cannot remove entries; removed votes simply leave
+    stale bits behind, which only ever show up as false positives.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        if capacity <= 0:
+            raise ValueError(f'Invalid filter capacity: {capacity}')
+        if not 0 < fp_rate < 1:
+            raise ValueError(f'Invalid false-positive rate: {fp_rate}')
+        self.capacity = capacity
+        self.target_fp_rate = fp_rate
+        # optimal sizing for n items at false-positive rate p:
+        #   m = -n ln(p) / ln(2)^2,  k = (m / n) ln(2)
+        self.num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        # number of insertions; re-adding a pair (e.g. vote removed then cast again) counts twice
+        self.count = 0
+        self._set_bits = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, user_ip: str, domain: str) -> Iterable[int]:
+        # Kirsch-Mitzenmacher double hashing: one digest yields all k positions
+        digest = blake2b(f'{user_ip}\0{domain}'.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, user_ip: str, domain: str) -> None:
+        for pos in self._positions(user_ip, domain):
+            mask = 1 << (pos & 7)
+            if not self._bits[pos >> 3] & mask:
+                self._bits[pos >> 3] |= mask
+                self._set_bits += 1
+        self.count += 1
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(*key))
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the underlying bit array."""
+        return len(self._bits)
+
+    @property
+    def fill_ratio(self) -> float:
+        """Fraction of bits currently set."""
+        return self._set_bits / self.num_bits
+
+    @property
+    def estimated_fp_rate(self) -> float:
+        """False-positive rate estimated from the actual fill of the bit array."""
+        return self.fill_ratio ** self.num_hashes
+
+
+# global singleton vote filter; None until loaded (or if disabled)
+VOTE_FILTER: VoteFilter | None = None
+
+
+def vote_filter_init(capacity: int, fp_rate: float, keys: Iterable[tuple[str, str]]) -> VoteFilter:
+    """Builds the global vote filter from existing ``(user_ip, site_domain)`` pairs."""
+    global VOTE_FILTER
+    vote_filter = VoteFilter(capacity, fp_rate)
+    for user_ip, domain in keys:
+        vote_filter.add(user_ip, domain)
+    VOTE_FILTER = vote_filter
+    return vote_filter
+
+
+def might_have_vote(user_ip: str, domain: str) -> bool:
+    """Returns False only if the user definitely has no vote for the domain.
+    Always True while the filter is disabled or not yet loaded.
+    """
+    if not VOTE_FILTER_ENABLED or VOTE_FILTER is None:
+        return True
+    return (user_ip, domain) in VOTE_FILTER
+
+
+def record_vote(user_ip: str, domain: str) -> None:
+    """Registers a newly created vote with the filter (if loaded)."""
+    if VOTE_FILTER is not None:
+        VOTE_FILTER.add(user_ip, domain)
+        if VOTE_FILTER.count % VOTE_FILTER_REPORT_INTERVAL == 0:
+            LOGGER.info('Vote filter: %d insertions (capacity %d), %.2f%% of bits set, '
+                        'estimated false-positive rate %.4g (designed for %.4g)',
+                        VOTE_FILTER.count, VOTE_FILTER.capacity, 100 * VOTE_FILTER.fill_ratio,
+                        VOTE_FILTER.estimated_fp_rate, VOTE_FILTER.target_fp_rate)
+        if VOTE_FILTER.count == VOTE_FILTER.capacity + 1:
+            LOGGER.warning('Vote filter exceeded its capacity of %d insertions; '
+                           'false-positive rate will rise above %.4g until restart',
+                           VOTE_FILTER.capacity, VOTE_FILTER.target_fp_rate)